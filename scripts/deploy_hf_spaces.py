@@ -32,20 +32,25 @@ class HuggingFaceDeployer:
         # Create app.py
         app_py_content = '''# app.py - Hugging Face Spaces version
 import os
+import re
 import json
+import hashlib
 import logging
+import sqlite3
 import asyncio
-import nest_asyncio
+import time
+import threading
 import pandas as pd
 import gradio as gr
 from datetime import datetime
 from typing import List, Dict, Any
 from dataclasses import dataclass
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Third-party imports
+# Third-party imports (PDF loading/splitting are imported lazily inside
+# RAGEngine._parse_and_split to keep Space cold-start fast)
 import google.generativeai as genai
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader
 from langchain_community.vectorstores import Chroma
 from langchain_community.tools import DuckDuckGoSearchRun
 from langchain_core.embeddings import Embeddings
@@ -56,29 +61,67 @@ GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
 if not GOOGLE_API_KEY:
     raise ValueError("GOOGLE_API_KEY environment variable is required")
 
+# Stay on the default gRPC transport: it keeps one persistent channel
+# for the life of the Space, and it is the only transport with a real
+# async client - REST binds a sync client under send_message_async,
+# breaking streaming and running blocking I/O on the event loop.
 genai.configure(api_key=GOOGLE_API_KEY)
-nest_asyncio.apply()
+
+# nest_asyncio monkey-patches the event loop and taxes every await; it is
+# only needed when running inside a notebook, never on the Space's ASGI server
+if os.environ.get("NANSC_IN_NOTEBOOK"):
+    import nest_asyncio
+    nest_asyncio.apply()
+
+class EmbeddingError(Exception):
+    """Raised when the embedding API fails; callers decide how to recover."""
+
 
 # Custom Embeddings (copy from your notebook)
 class GoogleEmbeddings(Embeddings):
+    # Gemini's embed_content accepts up to 100 texts per request
+    BATCH_SIZE = 100
+
     def __init__(self, model_name: str = "models/embedding-001"):
         self.model_name = model_name
         self.client = genai
 
+    @staticmethod
+    def _normalize(vec):
+        # Unit-length vectors let the cosine index score with a plain
+        # dot product
+        v = np.asarray(vec, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        if norm:
+            v = v / norm
+        return v.tolist()
+
+    def _embed_batch(self, texts):
+        """Embed a batch of texts in one API round-trip, bisecting on failure."""
+        try:
+            response = self.client.embed_content(
+                model=self.model_name,
+                content=list(texts),
+                task_type="retrieval_document"
+            )
+            return [self._normalize(v) for v in response['embedding']]
+        except Exception as e:
+            if len(texts) == 1:
+                raise
+            print(f"Warning: Batch embedding failed ({e}), retrying in halves...")
+            mid = len(texts) // 2
+            return self._embed_batch(texts[:mid]) + self._embed_batch(texts[mid:])
+
     def embed_documents(self, texts):
+        # No zero-vector fallback: a zero embedding stored in Chroma would
+        # match every query equally and silently poison retrieval
         try:
             results = []
-            for text in texts:
-                response = self.client.embed_content(
-                    model=self.model_name,
-                    content=text,
-                    task_type="retrieval_document"
-                )
-                results.append(response['embedding'])
+            for start in range(0, len(texts), self.BATCH_SIZE):
+                results.extend(self._embed_batch(texts[start:start + self.BATCH_SIZE]))
             return results
         except Exception as e:
-            print(f"Warning: Document embedding failed: {e}")
-            return [[0.0] * 768 for _ in texts]
+            raise EmbeddingError(f"Document embedding failed: {e}") from e
 
     def embed_query(self, text):
         try:
@@ -87,10 +130,73 @@ class GoogleEmbeddings(Embeddings):
                 content=text,
                 task_type="retrieval_query"
             )
-            return response['embedding']
+            return self._normalize(response['embedding'])
         except Exception as e:
-            print(f"Warning: Query embedding failed: {e}")
-            return [0.0] * 768
+            raise EmbeddingError(f"Query embedding failed: {e}") from e
+
+# Embedding cache: in-memory LRU fronting a sqlite file, so repeated
+# chunks (boilerplate headers/footers) and repeated queries skip the API
+class CachedGoogleEmbeddings(Embeddings):
+    LRU_SIZE = 10000
+
+    def __init__(self, inner: GoogleEmbeddings, cache_path: str):
+        self.inner = inner
+        self._lru = OrderedDict()
+        self._db = sqlite3.connect(cache_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key BLOB PRIMARY KEY, vec BLOB)"
+        )
+        self._db.commit()
+
+    def _key(self, kind: str, text: str) -> bytes:
+        payload = f"{self.inner.model_name}\\0{kind}\\0{text}"
+        return hashlib.sha256(payload.encode("utf-8")).digest()
+
+    def _put_lru(self, key: bytes, vec):
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.LRU_SIZE:
+            self._lru.popitem(last=False)
+
+    def _get(self, key: bytes):
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            return self._lru[key]
+        row = self._db.execute("SELECT vec FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        vec = np.frombuffer(row[0], dtype=np.float32).tolist()
+        self._put_lru(key, vec)
+        return vec
+
+    def embed_documents(self, texts):
+        keys = [self._key("doc", t) for t in texts]
+        results = [self._get(k) for k in keys]
+        miss_idx = [i for i, r in enumerate(results) if r is None]
+        if miss_idx:
+            vectors = self.inner.embed_documents([texts[i] for i in miss_idx])
+            rows = []
+            for i, vec in zip(miss_idx, vectors):
+                results[i] = vec
+                self._put_lru(keys[i], vec)
+                rows.append((keys[i], np.asarray(vec, dtype=np.float32).tobytes()))
+            self._db.executemany("INSERT OR IGNORE INTO cache VALUES (?, ?)", rows)
+            self._db.commit()
+        return results
+
+    def embed_query(self, text):
+        key = self._key("query", text)
+        vec = self._get(key)
+        if vec is None:
+            vec = self.inner.embed_query(text)
+            self._put_lru(key, vec)
+            self._db.execute(
+                "INSERT OR IGNORE INTO cache VALUES (?, ?)",
+                (key, np.asarray(vec, dtype=np.float32).tobytes())
+            )
+            self._db.commit()
+        return vec
 
 # System Configuration
 @dataclass
@@ -113,7 +219,8 @@ class TelemetryEvent:
 
 class ObservabilityService:
     def __init__(self):
-        self.events: List[TelemetryEvent] = []
+        # Bounded so a long-running Space cannot grow memory without limit
+        self.events: deque = deque(maxlen=1024)
         self.metrics = {"requests": 0, "tool_usage": 0, "errors": 0}
 
     def log_event(self, event_type: str, details: str):
@@ -133,49 +240,98 @@ class ObservabilityService:
     def get_logs(self) -> str:
         return "\\n".join([
             f"[{e.timestamp}] [{e.event_type}] {e.details}"
-            for e in self.events[-15:]
+            for e in list(self.events)[-15:]
         ])
 
     def get_metrics(self) -> Dict[str, int]:
         return self.metrics.copy()
 
-# Session Manager (copy from notebook)
+# Session Manager (one file per session; saving a turn no longer
+# re-reads and re-writes every other session's history)
 class SessionManager:
     def __init__(self, config: SystemConfig):
-        self.filepath = os.path.join(config.persistence_dir, "sessions.json")
+        self.sessions_dir = os.path.join(config.persistence_dir, "sessions")
+        os.makedirs(self.sessions_dir, exist_ok=True)
 
-    def save_session(self, session_id: str, history: List[Dict]):
-        data = {}
-        if os.path.exists(self.filepath):
-            try:
-                with open(self.filepath, 'r') as f:
-                    data = json.load(f)
-            except Exception as e:
-                print(f"Warning: Could not read session file: {e}")
+    def _session_path(self, session_id: str) -> str:
+        safe_id = re.sub(r"[^A-Za-z0-9._-]", "_", session_id)
+        return os.path.join(self.sessions_dir, f"{safe_id}.json")
 
-        data[session_id] = {
+    def save_session(self, session_id: str, history: List[Dict]):
+        record = {
             "timestamp": datetime.now().isoformat(),
             "history": history
         }
 
+        path = self._session_path(session_id)
+        tmp_path = path + ".tmp"
         try:
-            with open(self.filepath, 'w') as f:
-                json.dump(data, f, indent=2)
+            with open(tmp_path, 'w') as f:
+                json.dump(record, f, indent=2)
+            os.replace(tmp_path, path)
         except Exception as e:
             print(f"Warning: Could not save session: {e}")
 
     def load_session(self, session_id: str) -> List[Dict]:
-        if not os.path.exists(self.filepath):
+        path = self._session_path(session_id)
+        if not os.path.exists(path):
             return []
 
         try:
-            with open(self.filepath, 'r') as f:
-                data = json.load(f)
-                return data.get(session_id, {}).get("history", [])
+            with open(path, 'r') as f:
+                return json.load(f).get("history", [])
         except Exception as e:
             print(f"Warning: Could not load session: {e}")
             return []
 
+# Code patterns compiled once; _detect_and_call_tools runs on every message
+_ICAO_RE = re.compile(r"\\b[A-Z]{4}\\b")
+_AFTN_RE = re.compile(r"\\b[A-Z]{8}\\b")
+
+# Per-prefix X.400 templates built once, so converting an AFTN address
+# is just two slices and one format call in batch mode
+_AFTN_PRMD_MAP = {
+    "HE": "EGYPT", "OJ": "JORDAN", "EG": "UK",
+    "LF": "FRANCE", "K": "USA", "EH": "NETHERLANDS",
+    "ED": "GERMANY", "ZB": "CHINA", "RJ": "JAPAN",
+    "YS": "AUSTRALIA", "FA": "SOUTH AFRICA",
+    "OM": "UAE", "VH": "HONG KONG"
+}
+_AFTN_TEMPLATES = {
+    prefix: "/C=XX/A=ICAO/P=" + prmd + "/O={o}/OU1={ou}/"
+    for prefix, prmd in _AFTN_PRMD_MAP.items()
+}
+_AFTN_UNKNOWN_TEMPLATE = "/C=XX/A=ICAO/P=UNKNOWN/O={o}/OU1={ou}/"
+
+# Shared search client (one HTTP session with keep-alive for all lookups)
+# plus a result cache persisted across Space restarts
+_SEARCH = DuckDuckGoSearchRun()
+_WEB_CACHE_PATH = os.path.join(sys_config.persistence_dir, "websearch.json")
+_WEB_CACHE_MAX = 2048
+
+def _load_web_cache() -> Dict[str, str]:
+    if os.path.exists(_WEB_CACHE_PATH):
+        try:
+            with open(_WEB_CACHE_PATH, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not read web-search cache: {e}")
+    return {}
+
+_WEB_CACHE = _load_web_cache()
+# Batch lookups update the cache from worker threads concurrently
+_WEB_CACHE_LOCK = threading.Lock()
+
+def _save_web_cache():
+    """Persist the cache atomically; caller must hold _WEB_CACHE_LOCK."""
+    tmp_path = _WEB_CACHE_PATH + ".tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(_WEB_CACHE, f)
+        os.replace(tmp_path, _WEB_CACHE_PATH)
+    except Exception as e:
+        print(f"Warning: Could not save web-search cache: {e}")
+
 # ICAOTools (copy from notebook)
 class ICAOTools:
     AIRPORT_DB = {
@@ -197,15 +353,32 @@ class ICAOTools:
     }
 
     @staticmethod
-    def lookup_airport(icao_code: str) -> str:
+    def lookup_airport_local(icao_code: str):
+        """Resolve a code against the local DB; None means a web lookup is needed."""
         code = icao_code.upper().strip()
         if len(code) != 4:
             return f"Error: ICAO code must be exactly 4 characters. Got: '{code}'"
 
-        result = ICAOTools.AIRPORT_DB.get(code)
-        if result:
+        return ICAOTools.AIRPORT_DB.get(code)
+
+    @staticmethod
+    def lookup_airport(icao_code: str) -> str:
+        code = icao_code.upper().strip()
+        result = ICAOTools.lookup_airport_local(code)
+        if result is not None:
+            return result
+        return ICAOTools._lookup_airport_online(code)
+
+    @staticmethod
+    async def lookup_airport_async(icao_code: str) -> str:
+        code = icao_code.upper().strip()
+        result = ICAOTools.lookup_airport_local(code)
+        if result is not None:
             return result
+        return await asyncio.to_thread(ICAOTools._lookup_airport_online, code)
 
+    @staticmethod
+    def _lookup_airport_online(code: str) -> str:
         try:
             search_query = f"ICAO airport code {code} location airport name"
             search_result = ICAOTools.web_search(search_query)
@@ -239,145 +412,227 @@ class ICAOTools:
         if len(addr) != 8:
             return "Error: Address must be exactly 8 characters."
 
-        prmd_map = {
-            "HE": "EGYPT", "OJ": "JORDAN", "EG": "UK",
-            "LF": "FRANCE", "K": "USA", "EH": "NETHERLANDS",
-            "ED": "GERMANY", "ZB": "CHINA", "RJ": "JAPAN",
-            "YS": "AUSTRALIA", "FA": "SOUTH AFRICA",
-            "OM": "UAE", "VH": "HONG KONG"
-        }
-
-        prefix = addr[:2]
-        prmd = prmd_map.get(prefix, "UNKNOWN")
-
-        x400 = f"/C=XX/A=ICAO/P={prmd}/O={addr[:4]}/OU1={addr[4:]}/"
-        return x400
+        template = _AFTN_TEMPLATES.get(addr[:2], _AFTN_UNKNOWN_TEMPLATE)
+        return template.format(o=addr[:4], ou=addr[4:])
 
     @staticmethod
     def web_search(query: str) -> str:
+        cached = _WEB_CACHE.get(query)
+        if cached is not None:
+            return cached
+
         try:
-            search = DuckDuckGoSearchRun()
-            res = search.run(query)
-            return res[:1000]
+            res = _SEARCH.run(query)[:1000]
         except Exception as e:
-            error_msg = f"Search unavailable: {str(e)}"
-            return error_msg
+            # Failures are returned but never cached
+            return f"Search unavailable: {str(e)}"
+
+        with _WEB_CACHE_LOCK:
+            while len(_WEB_CACHE) >= _WEB_CACHE_MAX:
+                _WEB_CACHE.pop(next(iter(_WEB_CACHE)))
+            _WEB_CACHE[query] = res
+            _save_web_cache()
+        return res
 
 # RAGEngine (copy from notebook)
 class RAGEngine:
+    QUERY_CACHE_SIZE = 512
+
     def __init__(self, persistence_dir: str):
         self.persist_dir = os.path.join(persistence_dir, "chroma_db")
-        self.embeddings = GoogleEmbeddings(model_name="models/embedding-001")
+        self.embeddings = CachedGoogleEmbeddings(
+            GoogleEmbeddings(model_name="models/embedding-001"),
+            cache_path=os.path.join(persistence_dir, "embeddings_cache.sqlite3")
+        )
         self.vector_store = None
+        self._query_cache = OrderedDict()
+        self._is_empty = True
         self._init_db()
 
     def _init_db(self):
         try:
+            # HNSW tuned for a small corpus: cosine space plus modest
+            # M/ef trade a little recall headroom for lower search latency
             self.vector_store = Chroma(
                 persist_directory=self.persist_dir,
-                embedding_function=self.embeddings
+                embedding_function=self.embeddings,
+                collection_metadata={
+                    "hnsw:space": "cosine",
+                    "hnsw:M": 16,
+                    "hnsw:construction_ef": 100,
+                    "hnsw:search_ef": 32
+                }
             )
+            self._is_empty = self.vector_store._collection.count() == 0
         except Exception as e:
             print(f"⚠️ Warning: ChromaDB Init failed: {e}")
 
-    def ingest_pdf(self, file_path: str) -> str:
+    def _parse_and_split(self, file_path: str):
+        """Load one PDF and split it into chunks (no vector-store access)."""
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        from langchain_community.document_loaders import PyPDFLoader
+
+        loader = PyPDFLoader(file_path)
+        docs = loader.load()
+
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=1000,
+            chunk_overlap=100
+        )
+        return splitter.split_documents(docs)
+
+    def _add_with_retry(self, splits, attempts=3):
+        """Add documents with exponential backoff, bisecting on repeated
+        failure so one bad chunk cannot sink the whole batch. Returns the
+        number of chunks actually stored."""
+        delay = 1.0
+        last_error = None
+        for attempt in range(attempts):
+            try:
+                self.vector_store.add_documents(splits)
+                return len(splits)
+            except Exception as e:
+                last_error = e
+                if attempt + 1 < attempts:
+                    time.sleep(delay)
+                    delay *= 2
+
+        if isinstance(last_error, EmbeddingError):
+            # Retried above so a transient rate-limit burst can clear, but
+            # never bisected: the embedder already isolated the failure
+            # internally, and re-splitting here would replay doomed API
+            # calls against a bad key or exhausted quota
+            print(f"Warning: embedding failed, dropping {len(splits)} chunks: {last_error}")
+            return 0
+
+        if len(splits) == 1:
+            print(f"Warning: dropping chunk that failed to embed: {last_error}")
+            return 0
+
+        mid = len(splits) // 2
+        return (self._add_with_retry(splits[:mid], attempts)
+                + self._add_with_retry(splits[mid:], attempts))
+
+    def add_chunks(self, splits) -> str:
         if not self.vector_store or not self.embeddings:
             return "❌ Vector store not ready. Please check embeddings configuration."
 
-        try:
-            loader = PyPDFLoader(file_path)
-            docs = loader.load()
-
-            splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=100
-            )
-            splits = splitter.split_documents(docs)
+        added = self._add_with_retry(splits)
+        if added:
+            self._is_empty = False
+            # Cached answers may be stale once new documents arrive
+            self._query_cache.clear()
 
-            self.vector_store.add_documents(splits)
+        if added == len(splits):
+            return f"✅ Ingested {added} document chunks into vector store."
+        if added:
+            return f"⚠️ Ingested {added} of {len(splits)} chunks; the rest failed to embed."
+        return "❌ Error ingesting document: no chunks could be embedded."
 
-            message = f"✅ Ingested {len(splits)} document chunks into vector store."
-            return message
+    def ingest_pdf(self, file_path: str) -> str:
+        if not self.vector_store or not self.embeddings:
+            return "❌ Vector store not ready. Please check embeddings configuration."
 
+        try:
+            splits = self._parse_and_split(file_path)
         except Exception as e:
-            error_msg = f"❌ Error ingesting document: {str(e)}"
-            return error_msg
+            return f"❌ Error ingesting document: {str(e)}"
+
+        return self.add_chunks(splits)
 
     def query(self, question: str) -> str:
         if not self.vector_store:
             return ""
 
+        cached = self._query_cache.get(question)
+        if cached is not None:
+            self._query_cache.move_to_end(question)
+            return cached
+
         try:
-            docs = self.vector_store.similarity_search(question, k=3)
+            # embed_query goes through the embedding cache, so a repeated
+            # question skips the Gemini round-trip; searching by vector
+            # stops Chroma from re-embedding it a second time
+            vec = self.embeddings.embed_query(question)
+            docs = self.vector_store.max_marginal_relevance_search_by_vector(vec, k=3)
 
-            content = "\\n\\n".join([
+            content = "\\n\\n".join(
                 f"Document Chunk {i+1}:\\n{d.page_content[:500]}..."
                 for i, d in enumerate(docs)
-            ])
+            )
 
-            if content:
-                pass
+            self._query_cache[question] = content
+            while len(self._query_cache) > self.QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
 
             return content
 
         except Exception as e:
-            error_msg = f"Query failed: {str(e)}"
+            print(f"Query failed: {str(e)}")
             return ""
 
+# One compiled scan for procedure-type questions; the stem alternation
+# still catches plurals and derived forms ("regs", "procedures", "docs")
+_RAG_KEYWORD_RE = re.compile(
+    r"\\b(?:procedure|rule|reg|manual|doc|guideline|"
+    r"protocol|standard|regulation|policy|directive)",
+    re.IGNORECASE
+)
+
+# Passed once as system_instruction instead of being prepended to every
+# turn, which re-sent ~300 tokens of static prompt per message
+_SYSTEM_PROMPT = """
+You are the NANSC Intelligent Operations Console Assistant.
+
+OPERATIONAL PROTOCOL:
+1. DEFINITIONS: If the user asks "What is...", answer from your internal knowledge.
+   If unsure, use the 'web_search' tool.
+2. CODES: If an ICAO code (4 letters) or AFTN address (8 letters) is detected,
+   ALWAYS use 'lookup_airport' or 'bridge_aftn_to_amhs' tools automatically.
+3. PROCEDURES: If asked about rules/regs, refer to the RAG Context provided.
+
+BEHAVIORAL GUIDELINES:
+- Be professional, concise, and helpful
+- Always provide accurate information
+- Use tools proactively when appropriate
+- Maintain context throughout the conversation
+
+DOMAIN EXPERTISE:
+- Civil Aviation Telecommunications
+- ICAO Standards and Procedures
+- AFTN and AMHS Operations
+- Air Traffic Management
+- Aviation Safety and Security
+"""
+
 # EnterpriseAgent (copy from notebook)
 class EnterpriseAgent:
     def __init__(self):
         try:
-            self.model = genai.GenerativeModel(model_name=sys_config.model_name)
+            self.model = genai.GenerativeModel(
+                model_name=sys_config.model_name,
+                system_instruction=_SYSTEM_PROMPT
+            )
             self.chat = self.model.start_chat()
         except Exception as e:
             self.model = None
             self.chat = None
 
-    def _get_system_prompt(self) -> str:
-        return """
-        You are the NANSC Intelligent Operations Console Assistant.
-
-        OPERATIONAL PROTOCOL:
-        1. DEFINITIONS: If the user asks "What is...", answer from your internal knowledge.
-           If unsure, use the 'web_search' tool.
-        2. CODES: If an ICAO code (4 letters) or AFTN address (8 letters) is detected,
-           ALWAYS use 'lookup_airport' or 'bridge_aftn_to_amhs' tools automatically.
-        3. PROCEDURES: If asked about rules/regs, refer to the RAG Context provided.
-
-        BEHAVIORAL GUIDELINES:
-        - Be professional, concise, and helpful
-        - Always provide accurate information
-        - Use tools proactively when appropriate
-        - Maintain context throughout the conversation
-
-        DOMAIN EXPERTISE:
-        - Civil Aviation Telecommunications
-        - ICAO Standards and Procedures
-        - AFTN and AMHS Operations
-        - Air Traffic Management
-        - Aviation Safety and Security
-        """
-
     def _detect_and_call_tools(self, message: str) -> str:
-        import re
-        icao_pattern = r'\\b[A-Z]{4}\\b'
-        aftn_pattern = r'\\b[A-Z]{8}\\b'
-
-        icao_codes = re.findall(icao_pattern, message)
-        aftn_codes = re.findall(aftn_pattern, message)
+        # dict.fromkeys dedupes while preserving order, so a code mentioned
+        # twice in one message is only looked up once
+        icao_codes = list(dict.fromkeys(_ICAO_RE.findall(message)))
+        aftn_codes = list(dict.fromkeys(_AFTN_RE.findall(message)))
 
         tool_results = []
 
         for code in icao_codes:
-            if len(code) == 4:
-                result = ICAOTools.lookup_airport(code)
-                tool_results.append(f"ICAO Code {code}: {result}")
+            result = ICAOTools.lookup_airport(code)
+            tool_results.append(f"ICAO Code {code}: {result}")
 
         for code in aftn_codes:
-            if len(code) == 8:
-                result = ICAOTools.bridge_aftn_to_amhs(code)
-                tool_results.append(f"AFTN Code {code}: {result}")
+            result = ICAOTools.bridge_aftn_to_amhs(code)
+            tool_results.append(f"AFTN Code {code}: {result}")
 
         if tool_results:
             tool_output = "\\n".join(tool_results)
@@ -386,13 +641,15 @@ class EnterpriseAgent:
         else:
             return message
 
-    async def process_message(self, message: str) -> str:
+    async def process_message(self, message: str):
+        """Yield the response incrementally as Gemini streams tokens back."""
         if not message or not message.strip():
-            return "Please provide a message to process."
+            yield "Please provide a message to process."
+            return
 
         try:
             if not self.model or not self.chat:
-                return ("⚠️ System Warning: AI model not available. This could be due to:\\n"
+                yield ("⚠️ System Warning: AI model not available. This could be due to:\\n"
                        "1. API key configuration issues\\n"
                        "2. Quota limits exceeded\\n"
                        "3. Service connectivity problems\\n\\n"
@@ -402,28 +659,38 @@ class EnterpriseAgent:
                        "• Batch processing tools\\n"
                        "• System telemetry monitoring\\n\\n"
                        "Please check your API configuration or try again later.")
+                return
 
-            rag_context = ""
-            if any(keyword in message.lower() for keyword in [
-                "procedure", "rule", "reg", "manual", "doc", "guideline",
-                "protocol", "standard", "regulation", "policy", "directive"
-            ]):
+            # Querying an empty store would still pay for an embedding call
+            if not rag_engine._is_empty and _RAG_KEYWORD_RE.search(message):
                 rag_context = rag_engine.query(message)
                 if rag_context:
                     message = f"Reference Info from Manuals:\\n{rag_context}\\n\\nUser Question: {message}"
 
             enhanced_message = self._detect_and_call_tools(message)
 
-            system_prompt = self._get_system_prompt()
-            full_message = f"{system_prompt}\\n\\n{enhanced_message}"
-
-            response = await self.chat.send_message_async(full_message)
-
-            return response.text
+            partial = ""
+            try:
+                response = await self.chat.send_message_async(enhanced_message, stream=True)
+                async for chunk in response:
+                    if chunk.text:
+                        partial += chunk.text
+                        yield partial
+            except Exception:
+                if partial:
+                    # Tokens already went out; let the outer handler report
+                    raise
+                # Streaming setup failed (e.g. the active transport does
+                # not support it); retry once without stream=True
+                response = await self.chat.send_message_async(enhanced_message)
+                partial = response.text
+                yield partial
+
+            if not partial:
+                yield "⚠️ System Warning: Empty response from model."
 
         except Exception as e:
-            error_msg = f"⚠️ System Error: {str(e)}"
-            return error_msg
+            yield f"⚠️ System Error: {str(e)}"
 
     def get_session_history(self) -> List[Dict]:
         return []
@@ -440,47 +707,75 @@ agent = EnterpriseAgent()
 # Gradio Interface (copy from notebook cell 12)
 async def chat_wrapper(message, history):
     if not message or not message.strip():
-        return "Please enter a message to begin."
+        yield "Please enter a message to begin."
+        return
 
     try:
-        response = await agent.process_message(message)
-        return response
+        # ChatInterface renders each yielded partial, so users see tokens
+        # as they arrive instead of waiting for the full response
+        async for partial in agent.process_message(message):
+            yield partial
     except Exception as e:
-        error_msg = f"Error processing message: {str(e)}"
-        return error_msg
+        yield f"Error processing message: {str(e)}"
 
-def batch_tool_wrapper(text_input, operation):
+async def batch_tool_wrapper(text_input, operation):
     if not text_input or not text_input.strip():
         return pd.DataFrame(columns=["Input", "Result"])
 
     lines = [l.strip() for l in text_input.split('\\n') if l.strip()]
-    results = []
-
-    for line in lines:
-        try:
-            if operation == "Convert AFTN":
-                res = ICAOTools.bridge_aftn_to_amhs(line)
-            else:
-                res = ICAOTools.lookup_airport(line)
+    outs = []
 
-            results.append({"Input": line, "Result": res})
-
-        except Exception as e:
-            results.append({"Input": line, "Result": f"Error: {str(e)}"})
-
-    return pd.DataFrame(results)
+    if operation == "Convert AFTN":
+        # Pure string work, no network - run inline
+        for line in lines:
+            try:
+                outs.append(ICAOTools.bridge_aftn_to_amhs(line))
+            except Exception as e:
+                outs.append(f"Error: {str(e)}")
+    else:
+        # DB hits resolve inline; web-search fallbacks run concurrently
+        lookups = await asyncio.gather(
+            *[ICAOTools.lookup_airport_async(line) for line in lines],
+            return_exceptions=True
+        )
+        outs = [
+            f"Error: {str(res)}" if isinstance(res, Exception) else res
+            for res in lookups
+        ]
+
+    # Columnar construction skips pandas' row-wise dict inference
+    return pd.DataFrame({"Input": lines, "Result": outs}, copy=False)
+
+async def batch_tool_wrapper_batched(text_inputs, operations):
+    # Gradio batch entry point: each argument is a list of queued samples
+    frames = await asyncio.gather(*[
+        batch_tool_wrapper(text, op)
+        for text, op in zip(text_inputs, operations)
+    ])
+    return [list(frames)]
 
 def ingest_wrapper(files):
     if not files:
         return "No files provided. Please upload one or more PDF files."
 
     results = []
-    for file in files:
-        try:
-            result = rag_engine.ingest_pdf(file.name)
-            results.append(result)
-        except Exception as e:
-            results.append(f"❌ Error processing {file.name}: {str(e)}")
+    all_splits = []
+
+    # Parse PDFs in parallel threads (the CPU-heavy part), then add all
+    # chunks at once so embeddings go through the batched path together
+    with ThreadPoolExecutor(max_workers=min(8, len(files))) as pool:
+        futures = {pool.submit(rag_engine._parse_and_split, f.name): f for f in files}
+        for future in as_completed(futures):
+            file = futures[future]
+            try:
+                splits = future.result()
+                all_splits.extend(splits)
+                results.append(f"✅ Parsed {os.path.basename(file.name)}: {len(splits)} chunks")
+            except Exception as e:
+                results.append(f"❌ Error processing {file.name}: {str(e)}")
+
+    if all_splits:
+        results.append(rag_engine.add_chunks(all_splits))
 
     return "\\n".join(results)
 
@@ -490,7 +785,7 @@ def get_stats_wrapper():
     return json.dumps(metrics, indent=2), logs
 
 def clear_logs_wrapper():
-    telemetry.events = []
+    telemetry.events.clear()
     return "Logs cleared successfully."
 
 # Create Gradio Interface
@@ -529,9 +824,11 @@ with gr.Blocks(title="NANSC Intelligent Operations Console - Hugging Face") as d
                     label="Results"
                 )
                 b_button.click(
-                    batch_tool_wrapper,
+                    batch_tool_wrapper_batched,
                     inputs=[b_input, b_operation],
-                    outputs=b_output
+                    outputs=b_output,
+                    batch=True,
+                    max_batch_size=32
                 )
 
             with gr.Accordion("📚 Knowledge Base Management", open=False):
@@ -621,16 +918,22 @@ with gr.Blocks(title="NANSC Intelligent Operations Console - Hugging Face") as d
                 • Document-based queries and procedures
                 """
             )
+
+# Without a queue Gradio serializes requests at concurrency 1; allow
+# concurrent handlers so one slow lookup cannot block every other user
+demo.queue(default_concurrency_limit=8, max_size=64)
 '''
 
         with open(temp_path / "app.py", "w") as f:
             f.write(app_py_content)
 
-        # Create requirements.txt
+        # Create requirements.txt (only what app.py actually imports; the
+        # langchain meta-package and langchain-google-genai are unused and
+        # pull in a long dependency tail that slows Space builds)
         requirements_txt = '''google-generativeai>=0.3.0
-langchain>=0.0.300
+langchain-core>=0.1.0
+langchain-text-splitters>=0.0.1
 langchain-community>=0.0.20
-langchain-google-genai>=1.0.0
 chromadb>=0.4.0
 gradio>=4.0.0
 nest-asyncio>=1.6.0
@@ -742,17 +1045,6 @@ This system follows a 4-layer enterprise architecture:
             # Create deployment files
             self.create_deployment_files(temp_dir)
 
-            # Create git repository
-            subprocess.run(["git", "init"], cwd=temp_dir, check=True)
-            subprocess.run(["git", "checkout", "-b", "main"], cwd=temp_dir, check=True)
-
-            # Add files and commit
-            subprocess.run(["git", "add", "."], cwd=temp_dir, check=True)
-            subprocess.run([
-                "git", "commit", "-m",
-                "Initial commit: NANSC Intelligent Operations Console"
-            ], cwd=temp_dir, check=True)
-
             # Add remote repository (you'll need to create this manually first)
             print("⚠️ Please create your Hugging Face Space first:")
             print(f"1. Go to https://huggingface.co/spaces")
@@ -764,10 +1056,23 @@ This system follows a 4-layer enterprise architecture:
 
             space_repo = input("Enter your Hugging Face Space git URL (e.g., https://huggingface.co/spaces/username/space-name): ")
 
-            subprocess.run(["git", "remote", "add", "origin", space_repo], cwd=temp_dir, check=True)
-
-            # Push to Hugging Face
-            subprocess.run(["git", "push", "-u", "origin", "main", "--force"], cwd=temp_dir, check=True)
+            # One git invocation instead of six separate forks; set -e
+            # aborts at the first failing step, and the URL is passed as a
+            # positional argument rather than interpolated into the script
+            subprocess.run(
+                [
+                    "bash", "-c",
+                    "set -e; "
+                    "git init; "
+                    "git checkout -b main; "
+                    "git add .; "
+                    "git commit -m 'Initial commit: NANSC Intelligent Operations Console'; "
+                    'git remote add origin "$1"; '
+                    "git push -u origin main --force",
+                    "_", space_repo
+                ],
+                cwd=temp_dir, check=True
+            )
 
             print("✅ Files pushed to Hugging Face Spaces!")
             print("🔄 Waiting for deployment to start...")